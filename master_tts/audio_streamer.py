@@ -1,16 +1,42 @@
+import io
 import wave
 import struct
-import time
+import logging
 
 import socket
+from typing import BinaryIO, Iterable, Optional
+
+import numpy as np
+
+log = logging.getLogger(__name__)
+
+# Scale factor from signed 16 bit PCM to floats in the range -1.0 - 1.0
+PCM16_SCALE = 1.0 / 32768.0
+
+# Number of samples sent in the audio information packet when streaming audio of unknown length.
+STREAM_LENGTH_UNKNOWN = 0xFFFFFFFF
+
+# Number of frames read from a WAV file at a time while decoding.
+WAV_READ_CHUNK = 4096
+
+# Time in seconds a connect, send or ack read may block before the connection is considered lost.
+# The player drains frames continuously, so a healthy connection never stalls this long.
+SOCKET_TIMEOUT = 5.0
+
+# Audio information packet: rate, channels, bits, number of samples, packet size
+_HDR = struct.Struct("<IIIII")
+
+# Length prefix of each audio frame, an empty frame ends the audio.
+_LEN = struct.Struct("<I")
+_END_FRAME = _LEN.pack(0)
 
 class Audio:
-    frames: list[float]
+    frames: np.ndarray
     rate: int
     channels: int
     bits: int
 
-    def __init__(self, samples: list[float], rate: int, channels: int = 1, bits: int = 16):
+    def __init__(self, samples: np.ndarray, rate: int, channels: int = 1, bits: int = 16):
         self.frames = samples
         self.rate = rate
         self.channels = channels
@@ -24,54 +50,183 @@ class Audio:
             channels = wav.getnchannels()
             bits = wav.getsampwidth() * 8
 
-            print(rate)
-            print(channels)
+            log.debug("Decoding %s: rate %d, channels %d", wav_path, rate, channels)
+
+            # Read in chunks straight into a buffer of the final size
+            # so the whole file is never held as raw bytes as well.
+            pcm = np.empty(length * channels, dtype='<i2')
+            offset = 0
+            while offset < len(pcm):
+                data = wav.readframes(min(WAV_READ_CHUNK, (len(pcm) - offset) // channels))
+                if not data:
+                    break
+
+                chunk = np.frombuffer(data, dtype='<i2')
+                pcm[offset:offset + len(chunk)] = chunk
+                offset += len(chunk)
+
+            frames = np.multiply(pcm[:offset], PCM16_SCALE, dtype=np.float32)
+
+            return cls(frames, rate, channels, bits)
+
+    @classmethod
+    def from_wav_bytes(cls, data: bytes) -> 'Audio':
+        """
+        Decode WAV audio already held in memory, such as the output of Espeak.render_pcm.
+        The data chunk size in the header is not trusted since streamed WAV output leaves it unset.
+        """
+        with wave.open(io.BytesIO(data), 'rb') as wav:
+            rate = wav.getframerate()
+            channels = wav.getnchannels()
+            bits = wav.getsampwidth() * 8
 
-            frames_raw = wav.readframes(length)
-            frames = struct.unpack(f'{length * channels}h', frames_raw)
-            frames = [frame / 32768.0 for frame in frames]
+            frames_raw = wav.readframes(wav.getnframes())
+            frames = np.multiply(np.frombuffer(frames_raw, dtype='<i2'), PCM16_SCALE, dtype=np.float32)
 
             return cls(frames, rate, channels, bits)
         
     def amplify(self, factor: float):
-        self.frames = [frame * factor for frame in self.frames]
+        """
+        Scale the frames in place, clipping to the range -1.0 - 1.0 so they don't wrap when cast to PCM.
+        """
+        np.multiply(self.frames, factor, out=self.frames)
+        np.clip(self.frames, -1.0, 1.0, out=self.frames)
 
 class AudioStreamer:
-    sock: socket.socket
+    sock: Optional[socket.socket]
     address: str
     port: int
 
     def __init__(self, address: str, port: int):
         self.address = address
         self.port = port
+        self.sock = None
 
-    def start(self, audio: Audio, packet_size: int = 512):
-        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-        sock.connect((self.address, self.port))
+    def send(self, audio: Audio, packet_size: int = 512):
+        """
+        Stream audio to the audio player.
 
-        sock.send(
-            struct.pack("IIIII", audio.rate, audio.channels, audio.bits, len(audio.frames), packet_size)
-        )
+        Frames are sent back to back, the player paces playback
+        and TCP flow control holds the sender back when it falls behind.
 
-        sock.recv(1)
+        Params:
+            audio: The audio to stream.
+            packet_size: The maximum number of samples in each frame.
+        """
+        # Convert the whole clip to 16 bit PCM once, the loop only slices bytes.
+        pcm = np.clip(audio.frames, -1.0, 1.0)
+        pcm_bytes = memoryview((pcm * 32767.0).astype('<i2').tobytes())
 
-        i = 0
         length = len(audio.frames)
-        while i < length:
-            expected_packet_size = min(packet_size, length - i)
-            frames = audio.frames[i:i + expected_packet_size]
+        packets = (
+            pcm_bytes[i * 2:min(i + packet_size, length) * 2]
+            for i in range(0, length, packet_size)
+        )
+
+        sock = self._begin(audio.rate, audio.channels, audio.bits, length, packet_size)
+        self._send_frames(sock, packets)
+
+    def send_stream(self, reader: BinaryIO, rate: int, channels: int, bits: int, packet_size: int = 512):
+        """
+        Stream raw PCM audio from a file-like producer to the audio player.
+
+        Samples are forwarded as they are read so playback can start
+        before the producer has finished.
 
-            packet_values = [int(f * 32768.0) for f in frames]
+        Params:
+            reader: The producer to read raw PCM samples from until EOF.
+            rate: The sample rate of the audio.
+            channels: The number of channels in the audio.
+            bits: The number of bits per sample.
+            packet_size: The maximum number of samples in each frame.
+        """
+        packet_bytes = packet_size * (bits // 8)
 
-            packet = struct.pack(f"{expected_packet_size}h", *packet_values)
-            sock.send(packet)
+        def packets():
+            while True:
+                packet = reader.read(packet_bytes)
+                if not packet:
+                    return
+
+                yield packet
+
+        sock = self._begin(rate, channels, bits, STREAM_LENGTH_UNKNOWN, packet_size)
+        self._send_frames(sock, packets())
+
+    def ensure_connected(self) -> socket.socket:
+        """
+        Connect to the audio player unless already connected.
+        The connection is kept open and reused for every clip.
+
+        Returns:
+            The connected socket.
+        """
+        if self.sock:
+            return self.sock
+
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        # Don't let Nagle hold back the tail of a frame.
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 1 << 20)
+        # A player that vanished without closing the connection raises socket.timeout,
+        # an OSError, instead of blocking until the kernel gives up retransmitting.
+        sock.settimeout(SOCKET_TIMEOUT)
+        sock.connect((self.address, self.port))
 
-            sock.recv(1) # read ack packet
-            i += expected_packet_size
-            time.sleep(1 / audio.rate * expected_packet_size)
+        self.sock = sock
+        return sock
+
+    def close(self):
+        """
+        Close the connection to the audio player if open.
+        """
+        if self.sock:
+            self.sock.close()
+            self.sock = None
+
+    def _begin(self, rate: int, channels: int, bits: int, num_samples: int, packet_size: int) -> socket.socket:
+        """
+        Send the audio information packet and wait for the ack.
+        If the kept open connection was lost, reconnect once and try again.
+
+        Returns:
+            The connected socket, ready to send samples.
+        """
+        header = _HDR.pack(rate, channels, bits, num_samples, packet_size)
+
+        try:
+            return self._send_header(self.ensure_connected(), header)
+        except OSError:
+            self.close()
+            return self._send_header(self.ensure_connected(), header)
+
+    def _send_header(self, sock: socket.socket, header: bytes) -> socket.socket:
+        """
+        Send a packed audio information packet and wait for the ack.
+        """
+        sock.sendall(header)
+
+        if not sock.recv(1):
+            raise ConnectionError("Audio player closed the connection.")
+
+        return sock
+
+    def _send_frames(self, sock: socket.socket, packets: Iterable[bytes]):
+        """
+        Send each packet of samples as a length prefixed frame followed by the end frame.
+        """
+        try:
+            for packet in packets:
+                sock.sendall(_LEN.pack(len(packet)) + packet)
+
+            sock.sendall(_END_FRAME)
+        except OSError:
+            # Part of a clip may be in flight, start over on a new connection next time.
+            self.close()
+            raise
 
 if __name__ == "__main__":
     audio = Audio.from_wav("out.wav")
     streamer = AudioStreamer("10.201.48.52", 1337)
-    streamer.start(audio, 1024)
+    streamer.send(audio, 1024)
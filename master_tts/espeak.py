@@ -1,4 +1,7 @@
 import subprocess
+import logging
+
+log = logging.getLogger(__name__)
 
 class Espeak:
     espeak_path: str
@@ -10,12 +13,27 @@ class Espeak:
         self.pitch = pitch
         self.amplitude = amplitude
 
+    def args(self, *args) -> list[str]:
+        return [self.espeak_path, "-v", self.voice, "--sep=*", "-p", str(self.pitch), "-a", str(self.amplitude), *args]
+
     def call(self, *args):
-        subprocess_args = [self.espeak_path, "-v", self.voice, "--sep=*", "-p", str(self.pitch), "-a", str(self.amplitude), *args]
-        print(subprocess_args)
+        subprocess_args = self.args(*args)
+        log.debug("Calling espeak: %s", subprocess_args)
 
         return subprocess.check_output(subprocess_args).decode("utf-8")
 
+    def stream_text(self, text: str) -> subprocess.Popen:
+        """
+        Start rendering text to WAV audio written to the stdout pipe of the returned process.
+        """
+        return subprocess.Popen(self.args("--stdout", text), stdout=subprocess.PIPE)
+
+    def render_pcm(self, text: str) -> bytes:
+        """
+        Render text to WAV audio in memory without going through a file.
+        """
+        return subprocess.run(self.args("--stdout", text), check=True, capture_output=True).stdout
+
     def say_text(self, text: str):
         self.call(text)
     
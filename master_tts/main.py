@@ -11,17 +11,36 @@ espeak = Espeak()
 streamer = AudioStreamer("10.201.48.52", 1337)
 handler = TTS_Handler(streamer, espeak)
 
+async def tts_worker(tts_queue: asyncio.Queue[str]):
+    # Rendering and streaming block, keep them off the event loop.
+    while True:
+        text = await tts_queue.get()
+        try:
+            await asyncio.to_thread(handler.say_text, text)
+        except Exception as e:
+            print(f"Error saying text '{text}': {e}")
+        finally:
+            tts_queue.task_done()
+
+
 async def main():
+    tts_queue: asyncio.Queue[str] = asyncio.Queue()
+
     mqtt_client.connect()
     await mqtt_client.start()
+    # Keep a reference to the worker, the event loop only holds a weak one.
+    worker_task = asyncio.create_task(tts_worker(tts_queue))
 
-    def mqtt_tts_callback(topic, message):
-        handler.say_text(message.decode("utf-8"))
+    async def mqtt_tts_callback(topic, message):
+        tts_queue.put_nowait(message.decode("utf-8"))
 
     mqtt_client.subscribe("tts", mqtt_tts_callback)
 
-    while True:
-        await asyncio.sleep(1)
+    try:
+        while True:
+            await asyncio.sleep(1)
+    finally:
+        worker_task.cancel()
 
 
 async def non_mqtt_main():
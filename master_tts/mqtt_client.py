@@ -1,5 +1,9 @@
 import paho.mqtt.client as mqtt
 import asyncio
+import logging
+from collections import deque
+
+log = logging.getLogger(__name__)
 
 class MQTT_Client:
     """
@@ -28,9 +32,15 @@ class MQTT_Client:
         """
         self.client = mqtt.Client(client_id = client_id)
         self.callbacks = {}
-        self.callback_buffer = []
+        # Appended to from the paho network thread, deque appends and pops are atomic.
+        self.callback_buffer: deque[tuple[str, bytes]] = deque()
         self.loop_task = None
 
+        # Set from the paho network thread whenever a message is buffered.
+        # Both are bound to the running event loop so they are only created in start.
+        self._rx_event = None
+        self._loop = None
+
         if will_topic and will_message:
             self.client.will_set(will_topic, will_message, retain=will_retain)
 
@@ -62,7 +72,7 @@ class MQTT_Client:
             qos (int): The quality of service level to use.
             retain (bool): Whether the message should be retained by the broker.
         """
-        print(f"Publishing message to topic '{topic}': {message}")
+        log.debug("Publishing message to topic '%s': %s", topic, message)
         self.client.publish(topic, message, qos=qos, retain=retain)
 
     def subscribe(self, topic: str, callback_fn, qos: int = 0):
@@ -83,14 +93,17 @@ class MQTT_Client:
 
     async def poll(self, ignore_errors: bool = True):
         """
-        Poll for new messages and call the appropriate callback functions.
+        Wait for new messages and call the appropriate callback functions.
 
         Parameters:
             ignore_errors (bool): Whether to ignore any exceptions that occur while processing messages.
         """
         while True:
+            await self._rx_event.wait()
+            self._rx_event.clear()
+
             while self.callback_buffer:
-                topic, message = self.callback_buffer.pop(0)
+                topic, message = self.callback_buffer.popleft()
                 if topic in self.callbacks:
                     for callback in self.callbacks[topic]:
                         try:
@@ -99,25 +112,24 @@ class MQTT_Client:
                             print(f"Error in MQTT callback for topic '{topic}': {e}")
                             if not ignore_errors:
                                 raise e
-            await asyncio.sleep(0.1)
 
-    async def start(self, interval: float = 1.0, ignore_errors: bool = True):
+    async def start(self, ignore_errors: bool = True):
         """
-        Start a background task that polls for new messages at a given interval. 
+        Start a background task that calls the callback functions as soon as messages are received.
 
         Parameters:
-            interval (float): The interval at which to poll for new messages.
             ignore_errors (bool): Whether to ignore any exceptions that occur while processing messages.
         """
         if self.loop_task:
             raise RuntimeError("The MQTT client is already running.")
 
-        async def poll_loop():
-            while True:
-                await self.poll(ignore_errors)
-                await asyncio.sleep(interval)
+        # The event is created before the loop is set, the paho thread only uses it once the loop is set.
+        self._rx_event = asyncio.Event()
+        self._loop = asyncio.get_running_loop()
+        if self.callback_buffer:
+            self._rx_event.set()
 
-        self.loop_task = asyncio.create_task(poll_loop())
+        self.loop_task = asyncio.create_task(self.poll(ignore_errors))
         return self.loop_task
 
     def _on_rx(self, client, userdata, msg):
@@ -130,9 +142,11 @@ class MQTT_Client:
         """
         topic_str = msg.topic
         message = msg.payload
-        print(f"Received message on topic '{topic_str}': {message}")
+        log.debug("Received message on topic '%s': %s", topic_str, message)
         if topic_str in self.callbacks:
             self.callback_buffer.append((topic_str, message))
+            if self._loop:
+                self._loop.call_soon_threadsafe(self._rx_event.set)
 
 
 
@@ -1,6 +1,10 @@
-from audio_streamer import Audio, AudioStreamer
+import struct
+
+from audio_streamer import AudioStreamer
 from espeak import Espeak
 
+# Canonical 44 byte WAV header as written by espeak-ng.
+WAV_HEADER = struct.Struct("<4sI4s4sIHHIIHH4sI")
 
 
 class TTS_Handler:
@@ -13,11 +17,15 @@ class TTS_Handler:
 
 
     def say_text(self, text: str):
-        file_path = "out.wav"
-        self.espeak.say_text_to_file(text, file_path)
-
-        audio = Audio.from_wav(file_path)
-        self.streamer.start(audio, 512)
+        process = self.espeak.stream_text(text)
+        try:
+            header = WAV_HEADER.unpack(process.stdout.read(WAV_HEADER.size))
+            channels, rate, bits = header[6], header[7], header[10]
+
+            self.streamer.send_stream(process.stdout, rate, channels, bits, 512)
+        finally:
+            process.stdout.close()
+            process.wait()
 
 
 if __name__ == "__main__":
@@ -121,5 +121,7 @@ async def main():
     finally:
         skull1_mouth_servo.write(0.0)
         skull2_mouth_servo.write(0.0)
+        # Publish the final positions now, the event loop stops before a delayed publish would run.
+        mqtt_client.flush()
 
 asyncio.run(main())
\ No newline at end of file
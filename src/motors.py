@@ -10,6 +10,7 @@ class ServoMotor:
     servo_pwm: PWM
     min_value: int
     max_value: int
+    _span: int
     
     def __init__(self,
         servo_pin_number: int,
@@ -26,10 +27,14 @@ class ServoMotor:
             min_value: The first PWM duty value that generates any movement on the motor.
             max-value: The last PWM duty value that generates any movement on the motor.
         """
+        if min_value < DUTY_MIN or max_value > DUTY_MAX or min_value > max_value:
+            raise ValueError(f"Invalid pwm duty range: {min_value} - {max_value}")
+
         servo_pin = Pin(servo_pin_number)
         self.servo_pwm = PWM(servo_pin, hz)
         self.min_value = min_value
         self.max_value = max_value
+        self._span = max_value - min_value
 
     def write_duty(self, duty: int):
         """
@@ -54,7 +59,13 @@ class ServoMotor:
 
         if fraction < 0.0 or fraction > 1.0:
             raise ValueError(f"Attempting to write fraction out of range: {fraction}")
-        
-        pwm_value = self.min_value + int(fraction * (self.max_value - self.min_value))
-        self.write_duty(pwm_value) 
+
+        # The duty range is validated on construction so no second bounds check is needed.
+        self.servo_pwm.duty(self._duty_for(fraction))
+
+    def _duty_for(self, fraction: float) -> int:
+        """
+        Convert a fraction of the min - max range to a PWM duty value.
+        """
+        return self.min_value + int(fraction * self._span)
 
@@ -1,6 +1,17 @@
 import asyncio
+from collections import deque
 from umqtt.robust import MQTTClient
 
+# Print every published and received message.
+# Printing blocks on the UART so keep this off outside of debugging.
+DEBUG = False
+
+# Maximum number of received messages buffered before the oldest is dropped.
+CALLBACK_BUFFER_SIZE = 32
+
+# Time in seconds coalesced publishes are held back before being sent.
+COALESCE_INTERVAL = 0.01
+
 
 class AsyncMQTT:
     """
@@ -10,8 +21,10 @@ class AsyncMQTT:
     # MQTTClient instance
     client: MQTTClient
     callbacks: dict[str, list]
-    callback_buffer: list[tuple[str, bytes]]
+    callback_buffer: deque[tuple[str, bytes]]
     loop_task: asyncio.Task | None
+    _pending: dict[str, tuple[bytes, int, bool]]
+    _flush_task: asyncio.Task | None
 
     def __init__(
         self,
@@ -35,8 +48,10 @@ class AsyncMQTT:
         """
         self.client = MQTTClient(client_id,  broker, port, keepalive=20)
         self.callbacks = {}
-        self.callback_buffer = []
+        self.callback_buffer = deque((), CALLBACK_BUFFER_SIZE)
         self.loop_task = None
+        self._pending = {}
+        self._flush_task = None
 
         if will_topic and will_message:
             self.client.set_last_will(will_topic, will_message, retain=will_retain)
@@ -62,9 +77,54 @@ class AsyncMQTT:
             qos (int): The quality of service level to use.
             retain (bool): Whether the message should be retained by the broker.
         """
-        print(f"Publishing message to topic '{topic}': {message}")
+        if DEBUG:
+            print(f"Publishing message to topic '{topic}': {message}")
         self.client.publish(topic, message, qos=qos, retain=retain)
 
+    def publish_coalesced(self, topic: str, message: bytes, qos: int = 0, retain: bool = False):
+        """
+        Publish a message to a given topic after a short delay.
+        If another message is published to the same topic before then, only the latest one is sent.
+        Must be called while the event loop is running, call flush before it stops to send any pending messages.
+
+        Parameters:
+            topic (str): The topic to publish to.
+            message (bytes): The message to publish.
+            qos (int): The quality of service level to use.
+            retain (bool): Whether the message should be retained by the broker.
+        """
+        self._pending[topic] = (message, qos, retain)
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_pending())
+
+    async def _flush_pending(self):
+        """
+        Internal task publishing the latest pending message of each topic.
+        """
+        await asyncio.sleep(COALESCE_INTERVAL)
+
+        self._flush_task = None
+        self.flush()
+
+    def flush(self):
+        """
+        Publish the latest pending message of each topic immediately.
+        A failed publish is printed and does not stop the remaining topics from being published.
+        """
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+
+        pending = self._pending
+        self._pending = {}
+
+        for topic, (message, qos, retain) in pending.items():
+            try:
+                self.publish(topic, message, qos, retain)
+
+            except Exception as e:
+                print(f"Error publishing MQTT message to topic '{topic}': {e}")
+
     def subscribe(self, topic: str, callback_fn, qos: int = 0):
         """
         Subscribe to a given topic and register a callback function to be called when a message is received.
@@ -94,7 +154,7 @@ class AsyncMQTT:
 
             # Process any message in the callback buffer.
             while self.callback_buffer:
-                topic, message = self.callback_buffer.pop(0)
+                topic, message = self.callback_buffer.popleft()
 
                 if topic in self.callbacks:
                     for callback in self.callbacks[topic]:
@@ -137,7 +197,8 @@ class AsyncMQTT:
             message (bytes): The contents of the message that was published.
         """
         topic_str = topic.decode("utf-8")
-        print(f"Received message on topic '{topic_str}': {message}")
+        if DEBUG:
+            print(f"Received message on topic '{topic_str}': {message}")
         if topic_str in self.callbacks:
             self.callback_buffer.append((topic_str, message))
 
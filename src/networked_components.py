@@ -1,6 +1,7 @@
 import struct
 import asyncio
 import json
+import socket
 from asyncio import StreamReader, StreamWriter
 from neopixel import NeoPixel
 from machine import I2S, Pin
@@ -9,6 +10,100 @@ from motors import ServoMotor
 from rgbs import RGB_Led
 from mqtt import AsyncMQTT
 
+try:
+    # MicroPython compresses through deflate, its zlib.compress has no level argument.
+    import deflate
+    from io import BytesIO
+
+    def zlib_compress(data: bytes) -> bytes:
+        stream = BytesIO()
+        compressor = deflate.DeflateIO(stream, deflate.ZLIB, NEOPIXEL_COMPRESS_WBITS)
+        compressor.write(data)
+        compressor.close()
+        return stream.getvalue()
+
+except ImportError:
+    try:
+        from zlib import compress
+
+        def zlib_compress(data: bytes) -> bytes:
+            return compress(data, 1)
+
+    except ImportError:
+        # Not every MicroPython build can compress, snapshots are then always sent uncompressed.
+        zlib_compress = None
+
+# Packet formats, all little endian.
+# MicroPython's struct has no Struct class, so the formats are kept as strings with their sizes.
+_F32 = "<f"
+_F32_SIZE = struct.calcsize(_F32)
+_LEN = "<I"
+_LEN_SIZE = struct.calcsize(_LEN)
+_RGB = "BBB"
+_HDR = "<IIIII"
+_HDR_SIZE = struct.calcsize(_HDR)
+
+# Maximum number of bytes read from a servo TCP connection at a time.
+READ_CHUNK_SIZE = 64
+
+# Ack packet of the audio player
+_ACK = b"\xAD"
+
+# Number of audio frames the I2S buffer holds, and its minimum size in bytes.
+I2S_BUFFER_FRAMES = 3
+I2S_MIN_BUFFER = 4000
+
+# Time in seconds Neopixel writes are collected before the colors are published.
+NEOPIXEL_PUBLISH_DELAY = 0.05
+
+# Neopixel snapshots larger than this many bytes are zlib compressed before being published.
+NEOPIXEL_COMPRESS_THRESHOLD = 256
+
+# Window size of the snapshot compression as a power of 2.
+# A 512 byte window covers a whole snapshot of most strips without a large allocation on every publish.
+NEOPIXEL_COMPRESS_WBITS = 9
+
+def set_nodelay(writer: StreamWriter):
+    """
+    Disable Nagle's algorithm on the socket behind a connection stream if supported.
+    Small command and ack packets are then sent immediately.
+
+    Params:
+        writer: The stream of the connection.
+    """
+    try:
+        sock = writer.get_extra_info("socket")
+    except KeyError:
+        # MicroPython streams only expose the peer name, the socket is kept in writer.s
+        sock = getattr(writer, "s", None)
+
+    if sock is not None and hasattr(socket, "TCP_NODELAY"):
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+async def readinto_exactly(reader: StreamReader, buf: memoryview):
+    """
+    Fill a buffer with data from a stream without allocating.
+
+    Params:
+        reader: The stream to read from.
+        buf: The buffer to fill.
+
+    Raises:
+        EOFError: If the stream ends before the buffer is filled.
+    """
+    filled = 0
+    while filled < len(buf):
+        n = await reader.readinto(buf[filled:])
+        if not n:
+            raise EOFError()
+        filled += n
+
+def clamp_color_value(value: int) -> int:
+    """
+    Clamp a color channel value to the range 0 - 255.
+    """
+    return 0 if value < 0 else (255 if value > 255 else value)
+
 class AsyncTCP_ServoMotor:
     """
     A servo motor controled by an async TCP connection.
@@ -24,20 +119,30 @@ class AsyncTCP_ServoMotor:
     port: int
     server: asyncio.Server
     current_value: float
+    debug: bool
+    _handlers: tuple
 
-    def __init__(self, motor: ServoMotor, host: str, port: int):
+    def __init__(self, motor: ServoMotor, host: str, port: int, debug: bool = False):
         """
         Initialize a new AsyncTCP_ServoMotor class instance.
 
         Params:
             motor: The motor to control.
             host: The host to connect to.
+            debug: Whether to print every connection and command.
         """
         self.motor = motor
         self.host = host
         self.port = port
         self.server = None # type: ignore
         self.current_value = 0.0
+        self.debug = debug
+
+        # Payload size and handler of each command, indexed by the command byte.
+        self._handlers = (
+            (0, self.on_read_command),
+            (_F32_SIZE, self.on_write_command),
+        )
 
     async def start(self):
         if self.server:
@@ -49,33 +154,71 @@ class AsyncTCP_ServoMotor:
 
     async def handle_connection(self, reader: StreamReader, writer: StreamWriter):
 
-        print("Connection established.")
+        if self.debug:
+            print("Connection established.")
 
-        while True:
-            cmd_bytes = await reader.read(1)
-            if cmd_bytes is None:
-                break
-            
-            cmd = struct.unpack("B", cmd_bytes)[0]
+        set_nodelay(writer)
+
+        # Read whatever has arrived and handle every complete command in it,
+        # only waiting on the socket again once more data is needed.
+        inbuf = bytearray()
+        try:
+            while True:
+                data = await reader.read(READ_CHUNK_SIZE)
+                # An empty read means the client disconnected.
+                if not data:
+                    break
+
+                inbuf.extend(data)
+                handled = self.handle_commands(writer, inbuf)
+                if handled:
+                    inbuf = inbuf[handled:]
 
+                await writer.drain()
+        finally:
+            writer.close()
+            await writer.wait_closed()
 
-            if cmd == 0:
-                print("Read command.")
-                await self.on_read_command(reader, writer)
+    def handle_commands(self, writer: StreamWriter, inbuf: bytearray) -> int:
+        """
+        Handle every complete command at the start of a buffer.
+
+        Params:
+            writer: The stream to write responses to.
+            inbuf: The received data.
+
+        Returns:
+            The number of bytes handled.
+        """
+        handlers = self._handlers
+
+        offset = 0
+        while offset < len(inbuf):
+            cmd = inbuf[offset]
+
+            if cmd >= len(handlers):
+                if self.debug:
+                    print(f"Unknown command: {cmd}")
+                offset += 1
+                continue
 
-            elif cmd == 1:
-                print("Write command.")
-                await self.on_write_command(reader, writer)
+            payload_size, handler = handlers[cmd]
+            if len(inbuf) - offset - 1 < payload_size:
+                break
+
+            if self.debug:
+                print(f"Command: {cmd}")
+            handler(writer, inbuf, offset + 1)
+            offset += 1 + payload_size
 
-            else:
-                print(f"Unknown command: {cmd}")
+        return offset
 
-    async def on_read_command(self, reader: StreamReader, writer: StreamWriter):
-        resp_packet = struct.pack("f", self.current_value)
+    def on_read_command(self, writer: StreamWriter, inbuf: bytearray, offset: int):
+        resp_packet = struct.pack(_F32, self.current_value)
         writer.write(resp_packet)
 
-    async def on_write_command(self, reader: StreamReader, writer: StreamWriter):
-        value = struct.unpack("f", await reader.read(4))[0]
+    def on_write_command(self, writer: StreamWriter, inbuf: bytearray, offset: int):
+        value = struct.unpack_from(_F32, inbuf, offset)[0]
         self.motor.write_fraction(value)
         self.current_value = value
 
@@ -89,18 +232,24 @@ class MQTT_ServoMotor:
         <topic_root>/write
             This topic is used to write a new value to the motor.
             Expected payload: a utf-8 encoded json object in the form {"percent": [0.0 - 1.0]}
+            Binary payload: a 4 byte little endian float [0.0 - 1.0]
 
         <topic_root>/read
             This topic is used to export the current value of the motor.
             Whenever the motor value changes, it will be published to this topic.
+            Changes close together are coalesced and only the latest value is published.
             Expected payload: a utf-8 encoded json object in the form {"percent": [0.0 - 1.0]}
+            Binary payload: a 4 byte little endian float [0.0 - 1.0]
     """
     motor: ServoMotor
     mqtt: AsyncMQTT
     topic_root: str
+    write_topic: str
+    read_topic: str
     current_value: float
+    binary: bool
 
-    def __init__(self, motor: ServoMotor, mqtt: AsyncMQTT, topic_root: str):
+    def __init__(self, motor: ServoMotor, mqtt: AsyncMQTT, topic_root: str, binary: bool = False):
         """
         Initialize a new MQTT_ServoMotor class instance.
 
@@ -108,11 +257,18 @@ class MQTT_ServoMotor:
             motor (ServoMotor): The motor to control.
             mqtt (AsyncMQTT): The MQTT client to use.
             topic_root (str): The root topic to use for this motor.
+            binary (bool): Whether to use the binary payloads instead of utf-8 text.
         """
         self.motor = motor
         self.mqtt = mqtt
         self.topic_root = topic_root
+        self.write_topic = f"{topic_root}/write"
+        self.read_topic = f"{topic_root}/read"
         self.current_value = 0.0
+        self.binary = binary
+
+        # Writes of the current value are skipped, so start the hardware in the same state.
+        self.motor.write_fraction(self.current_value)
         self.mqtt.subscribe(self.write_topic, self._on_write_packet, 1)
 
     def write(self, value: float):
@@ -123,11 +279,18 @@ class MQTT_ServoMotor:
         Parameters:
             value (float): The new percentage value for the motor.
         """
+        if value == self.current_value:
+            return
+
         self.motor.write_fraction(value)
-        print(value, self.current_value)
-        if value != self.current_value:
-            self.current_value = value
-            self.mqtt.publish(self.read_topic, json.dumps({"percent": value}).encode("utf-8"), 1)
+        self.current_value = value
+
+        if self.binary:
+            payload = struct.pack(_F32, value)
+        else:
+            payload = ('{"percent":%s}' % value).encode("utf-8")
+
+        self.mqtt.publish_coalesced(self.read_topic, payload, 0)
 
     def read(self) -> float:
         """
@@ -143,8 +306,11 @@ class MQTT_ServoMotor:
         Callback function for the write topic.
         This function will parse the message and write the new value to the motor. 
         """
-        
-        value = float(message.decode("utf-8"))
+        if self.binary:
+            value = struct.unpack(_F32, message)[0]
+        else:
+            value = float(message.decode("utf-8"))
+
         self.write(value)
 
         """
@@ -159,14 +325,6 @@ class MQTT_ServoMotor:
             print(f"Invalid MQTT_ServoMotor message: {message_text}")
         """
 
-    @property
-    def write_topic(self) -> str:
-        return f"{self.topic_root}/write"    
-    
-    @property
-    def read_topic(self) -> str:
-        return f"{self.topic_root}/read"
-
 
 class MQTT_RGB_Led:
     """
@@ -178,19 +336,24 @@ class MQTT_RGB_Led:
             This topic is used to write a new color to the LED.
             Expected payload: a utf-8 encoded json object in the form {"r": [0-255], "g": [0-255], "b": [0-255]}
             Any colors not provided will hold their current value.
+            Binary payload: 3 unsigned bytes r, g, b
 
         <topic_root>/read
             This topic is used to export the current color of the LED.
             Whenever the LED color changes, it will be published to this topic.
             Expected payload: a utf-8 encoded json object in the form {"r": [0-255], "g": [0-255], "b": [0-255]}
+            Binary payload: 3 unsigned bytes r, g, b
     """
 
     rgb: RGB_Led
     mqtt: AsyncMQTT
     topic_root: str
+    write_topic: str
+    read_topic: str
     current_color: tuple[int, int, int]
+    binary: bool
 
-    def __init__(self, rgb: RGB_Led, mqtt: AsyncMQTT, topic_root: str):
+    def __init__(self, rgb: RGB_Led, mqtt: AsyncMQTT, topic_root: str, binary: bool = False):
         """
         Initialize a new MQTT_RGB_Led class instance.
 
@@ -198,11 +361,18 @@ class MQTT_RGB_Led:
             rgb (RGB_Led): The RGB LED to control.
             mqtt (AsyncMQTT): The MQTT client to use.
             topic_root (str): The root topic to use for this LED.
+            binary (bool): Whether to use the binary payloads instead of utf-8 json.
         """
         self.rgb = rgb
         self.mqtt = mqtt
         self.topic_root = topic_root
+        self.write_topic = f"{topic_root}/write"
+        self.read_topic = f"{topic_root}/read"
         self.current_color = (0, 0, 0)
+        self.binary = binary
+
+        # Writes of the current color are skipped, so start the hardware in the same state.
+        self.rgb.set_color(self.current_color)
 
         self.mqtt.subscribe(self.write_topic, self._on_write_packet, 1)
 
@@ -215,10 +385,18 @@ class MQTT_RGB_Led:
         Parameters:
             color (tuple[int, int, int]): The new color for the LED.
         """
+        if color == self.current_color:
+            return
+
         self.rgb.set_color(color)
-        if color != self.current_color:
-            self.current_color = color
-            self.mqtt.publish(self.read_topic, json.dumps({"r": color[0], "g": color[1], "b": color[2]}).encode("utf-8"), 1)
+        self.current_color = color
+
+        if self.binary:
+            payload = struct.pack(_RGB, *color)
+        else:
+            payload = ('{"r":%d,"g":%d,"b":%d}' % color).encode("utf-8")
+
+        self.mqtt.publish(self.read_topic, payload, 0)
 
     def read(self) -> tuple[int, int, int]:
         """
@@ -234,8 +412,11 @@ class MQTT_RGB_Led:
         Callback function for the write topic.
         This function will parse the message and write the new color to the LED. 
         """
-        message_text = message.decode("utf-8")
-        message_data = json.loads(message_text)
+        if self.binary:
+            self.write(struct.unpack(_RGB, message))
+            return
+
+        message_data = json.loads(message)
 
         r = message_data.get("r", self.current_color[0])
         g = message_data.get("g", self.current_color[1])
@@ -243,14 +424,6 @@ class MQTT_RGB_Led:
 
         self.write((r, g, b))
 
-    @property
-    def write_topic(self) -> str:
-        return f"{self.topic_root}/write"
-    
-    @property
-    def read_topic(self) -> str:
-        return f"{self.topic_root}/read"
-    
 
 class MQTT_Neopixel:
     """
@@ -263,6 +436,11 @@ class MQTT_Neopixel:
             Expected payload: a utf-8 encoded json array of colors in the form [[r, g, b], [r, g, b], ...]
             The length of the array must match the number of leds in the Neopixel.
 
+        <topic_root>/write/raw
+            This topic is used to write a new list of colors to the Neopixel without any parsing.
+            Expected payload: 3 unsigned bytes r, g, b for each led of the Neopixel.
+            The length of the payload must be 3 times the number of leds in the Neopixel.
+
         <topic_root>/write/single
             This topic is used to write a new color to a single led of the Neopixel.
             Expected payload: a utf-8 encoded json object in the form {"index": [0 - n], "color": [r, g, b]}
@@ -274,13 +452,24 @@ class MQTT_Neopixel:
         <topic_root>/read
             This topic is used to export the current colors of the Neopixel.
             Whenever the Neopixel are written, they will be published to this topic.
-            Expected payload: a utf-8 encoded json array of colors in the form [[r, g, b], [r, g, b], ...]
+            Writes close together are published once with the latest colors.
+            Expected payload: 1 flag byte followed by the colors.
+                0x00: 3 unsigned bytes r, g, b for each led of the Neopixel.
+                0x01: the same bytes zlib compressed, used for large Neopixels.
     """
     np: NeoPixel
     mqtt: AsyncMQTT
     topic_root: str
-    current_colors: list[tuple[int, int, int]] | None
+    write_list_topic: str
+    write_raw_topic: str
+    write_single_topic: str
+    write_all_topic: str
+    read_topic: str
+    current_colors: bytearray
     length: int
+    buf: bytearray
+    _bpp: int
+    _publish_task: asyncio.Task | None
 
     def __init__(self, np: NeoPixel, mqtt: AsyncMQTT, topic_root: str):
         """
@@ -294,12 +483,26 @@ class MQTT_Neopixel:
         self.np = np
         self.mqtt = mqtt
         self.topic_root = topic_root
-        self.current_colors = None
+        self.write_list_topic = f"{topic_root}/write/list"
+        self.write_raw_topic = f"{topic_root}/write/raw"
+        self.write_single_topic = f"{topic_root}/write/single"
+        self.write_all_topic = f"{topic_root}/write/all"
+        self.read_topic = f"{topic_root}/read"
         self.length = np.n
+        # The current colors as 3 bytes r, g, b for each led, kept in one buffer instead of a tuple per led.
+        self.current_colors = bytearray(3 * self.length)
+        self._publish_task = None
+
+        # Colors are written straight into the NeoPixel buffer which holds them in the led's byte order.
+        # The color channel stored at each byte of a pixel, (1, 0, 2) for GRB leds.
+        self.buf = np.buf
+        self._bpp = np.bpp
+        self._order = tuple(np.ORDER.index(i) for i in range(3))
 
         self.write_all((0, 0, 0))
 
         self.mqtt.subscribe(self.write_list_topic, self._on_write_list_packet, 1)
+        self.mqtt.subscribe(self.write_raw_topic, self._on_write_raw_packet, 1)
         self.mqtt.subscribe(self.write_single_topic, self._on_write_single_packet, 1)
         self.mqtt.subscribe(self.write_all_topic, self._on_write_all_packet, 1)
 
@@ -313,11 +516,43 @@ class MQTT_Neopixel:
         if len(colors) != self.length:
             raise ValueError(f"Attempting to write list of colors with invalid length: {len(colors)} expected: {self.length}")
 
+        # Hoisted into locals as this runs for every led.
+        current_colors = self.current_colors
+        buf = self.buf
+        bpp = self._bpp
+        o0, o1, o2 = self._order
+        pack_into = struct.pack_into
         for i, color in enumerate(colors):
-            self.np[i] = color
+            pack_into(_RGB, current_colors, i * 3, color[0], color[1], color[2])
+            pack_into(_RGB, buf, i * bpp, color[o0], color[o1], color[o2])
+
+        self.np.write()
+        self.publish_colors()
+
+    def write_raw(self, data: bytes):
+        """
+        Write a new list of colors to the Neopixel from raw bytes.
+
+        Parameters:
+            data (bytes): 3 bytes r, g, b for each led of the Neopixel.
+        """
+        if len(data) != 3 * self.length:
+            raise ValueError(f"Attempting to write raw colors with invalid length: {len(data)} expected: {3 * self.length}")
+
+        buf = self.buf
+        bpp = self._bpp
+        if bpp == 3 and self._order == (0, 1, 2):
+            buf[:] = data
+        else:
+            o0, o1, o2 = self._order
+            for i, offset in enumerate(range(0, len(data), 3)):
+                pixel = i * bpp
+                buf[pixel] = data[offset + o0]
+                buf[pixel + 1] = data[offset + o1]
+                buf[pixel + 2] = data[offset + o2]
 
         self.np.write()
-        self.current_colors = colors
+        self.current_colors[:] = data
         self.publish_colors()
 
     def write_single(self, i: int, color: tuple[int, int, int]):
@@ -331,9 +566,9 @@ class MQTT_Neopixel:
         if i < 0 or i >= self.length:
             raise ValueError(f"Attempting to write color to invalid led index: {i}, expected: 0 - {self.length - 1}")
 
-        self.np[i] = color
+        struct.pack_into(_RGB, self.current_colors, i * 3, color[0], color[1], color[2])
+        self._pack_pixel(i, color)
         self.np.write()
-        self.current_colors[i] = color
         self.publish_colors()
 
     def write_all(self, color: tuple[int, int, int]):
@@ -343,13 +578,25 @@ class MQTT_Neopixel:
         Parameters:
             color (tuple[int, int, int]): The new color for all leds.
         """
-        for i in range(self.length):
-            self.np[i] = color
+        # Pack the first pixel and repeat it over the rest of the buffer.
+        bpp = self._bpp
+        self._pack_pixel(0, color)
+        self.buf[bpp:] = self.buf[:bpp] * (self.length - 1)
+
+        current_colors = self.current_colors
+        struct.pack_into(_RGB, current_colors, 0, color[0], color[1], color[2])
+        current_colors[3:] = current_colors[:3] * (self.length - 1)
 
         self.np.write()
-        self.current_colors = [color] * self.length
         self.publish_colors()
 
+    def _pack_pixel(self, i: int, color: tuple[int, int, int]):
+        """
+        Pack a color into the NeoPixel buffer for the led at a given index in the led's byte order.
+        """
+        order = self._order
+        struct.pack_into(_RGB, self.buf, i * self._bpp, color[order[0]], color[order[1]], color[order[2]])
+
     def read(self) -> list[tuple[int, int, int]]:
         """
         Read the current colors of the Neopixel.
@@ -357,34 +604,78 @@ class MQTT_Neopixel:
         Returns:
             list[tuple[int, int, int]]: The current colors of the Neopixel.
         """
-        return self.current_colors or [(0, 0, 0)] * self.length
+        current_colors = self.current_colors
+        return [tuple(current_colors[offset:offset + 3]) for offset in range(0, len(current_colors), 3)]
 
     def publish_colors(self):
         """
-        Publish the current colors of the Neopixel to the read topic.
+        Publish the current colors of the Neopixel to the read topic after a short delay.
+        Any writes made before then are included in the same publish.
+        """
+        if self._publish_task is None:
+            self._publish_task = asyncio.create_task(self._publish_after(NEOPIXEL_PUBLISH_DELAY))
+
+    async def _publish_after(self, delay: float):
+        """
+        Internal task publishing the current colors once the delay has passed.
+        """
+        await asyncio.sleep(delay)
+        self._publish_task = None
+
+        self.mqtt.publish(self.read_topic, self.encode_snapshot(bytes(self.current_colors)), 0)
+
+    def encode_snapshot(self, colors: bytes) -> bytes:
+        """
+        Add the flag byte to a snapshot of the colors, compressing it if it is large.
+
+        Parameters:
+            colors (bytes): 3 bytes r, g, b for each led of the Neopixel.
+
+        Returns:
+            bytes: The read topic payload.
         """
-        self.mqtt.publish(self.read_topic, json.dumps(self.read()).encode("utf-8"), 1)
+        if zlib_compress and len(colors) > NEOPIXEL_COMPRESS_THRESHOLD:
+            # Repeated colors compress well even with a small window.
+            # If compression fails the snapshot is still published uncompressed.
+            try:
+                compressed = zlib_compress(colors)
+            except Exception as e:
+                print(f"Error compressing Neopixel snapshot: {e}")
+                compressed = colors
+
+            if len(compressed) < len(colors):
+                return b"\x01" + compressed
+
+        return b"\x00" + colors
 
     async def _on_write_list_packet(self, topic: str, message: bytes):
         """
         Callback function for the write list topic.
         """
-        message_text = message.decode("utf-8")
-        message_data = json.loads(message_text)
+        colors = json.loads(message)
+
+        # Validate the parsed list in place, write_list checks its length and packs it.
+        validate_color = self.validate_color
+        for i, color in enumerate(colors):
+            colors[i] = validate_color(color)
 
-        colors = [self.validate_color(color) for color in message_data]
         self.write_list(colors)
 
+    async def _on_write_raw_packet(self, topic: str, message: bytes):
+        """
+        Callback function for the write raw topic.
+        """
+        self.write_raw(message)
+
     async def _on_write_single_packet(self, topic: str, message: bytes):
         """
         Callback function for the write single topic.
         """
-        message_text = message.decode("utf-8")
-        message_data = json.loads(message_text)
+        message_data = json.loads(message)
 
         i = message_data.get("index", None)
         if i is None:
-            print(f"Invalid MQTT_Neopixel write single message missing index: {message_text}")
+            print(f"Invalid MQTT_Neopixel write single message missing index: {message.decode('utf-8')}")
             return
 
         color = self.validate_color(message_data.get("color", (0, 0, 0)))
@@ -394,28 +685,11 @@ class MQTT_Neopixel:
         """
         Callback function for the write all topic.
         """
-        message_text = message.decode("utf-8")
-        message_data = json.loads(message_text)
+        message_data = json.loads(message)
 
         color = self.validate_color(message_data.get("color", (0, 0, 0)))
         self.write_all(color)
 
-    @property
-    def write_list_topic(self) -> str:
-        return f"{self.topic_root}/write/list"
-    
-    @property
-    def write_single_topic(self) -> str:
-        return f"{self.topic_root}/write/single"
-    
-    @property
-    def write_all_topic(self) -> str:
-        return f"{self.topic_root}/write/all"
-
-    @property
-    def read_topic(self) -> str:
-        return f"{self.topic_root}/read"
-
     def validate_color(self, color: tuple[int, int, int]) -> tuple[int, int, int]:
         """
         Clean and validate a color tuple.
@@ -430,9 +704,9 @@ class MQTT_Neopixel:
             return (0, 0, 0)
         
         return (
-            max(0, min(255, color[0])),
-            max(0, min(255, color[1])),
-            max(0, min(255, color[2]))
+            clamp_color_value(color[0]),
+            clamp_color_value(color[1]),
+            clamp_color_value(color[2])
         )
 
 
@@ -449,17 +723,24 @@ class AsyncTCP_AudioPlayer:
             - Sample Rate        : 4 byte unsigned integer
             - Number of channels : 4 byte unsigned integer
             - Bits per sample    : 4 byte unsigned integer
-            - Number of samples  : 4 byte unsigned integer
+            - Number of samples  : 4 byte unsigned integer (0xFFFFFFFF if unknown)
             - Packet Size        : 4 byte unsigned integer
 
         Server responds with an ack packet
             - 1 byte unsigned integer (0xAD)
 
-        Client sends audio data packets
-            - Samples : <Packet Size> * 2 signed integers
+        Client sends audio data frames back to back
+            - Length  : 4 byte unsigned integer
+            - Samples : <Length> bytes, at most <Packet Size> signed integers of <Bits per sample>
 
-        Server responds with an ack packet
-            - 1 byte unsigned integer (0xAD)
+        Client sends an end frame
+            - Length  : 4 byte unsigned integer (0)
+
+        Frames are only read when the I2S buffer has room,
+        TCP flow control then holds the client back.
+        I2S is written without blocking so the next frame is read while the last one plays.
+
+        The connection is kept open, the client sends a new audio details packet for the next audio.
     """
     sck_pin: Pin
     ws_pin: Pin
@@ -482,35 +763,86 @@ class AsyncTCP_AudioPlayer:
 
     async def handle_connection(self, reader: StreamReader, writer: StreamWriter):
         print("Connection established.")
+        set_nodelay(writer)
+
+        i2s = None
+        i2s_writer = None
+        i2s_details = None
+        frame_buf = None
+
+        try:
+            # The connection is kept open, each audio starts with a new audio details packet.
+            while True:
+                try:
+                    audio_details = await reader.readexactly(_HDR_SIZE)
+                except EOFError:
+                    break
+
+                sample_rate, num_channels, bits_per_sample, num_samples, packet_size = struct.unpack(_HDR, audio_details)
+                max_frame_length = packet_size * (bits_per_sample // 8)
+
+                # Only reconfigure I2S if the audio format changed.
+                if (sample_rate, num_channels, bits_per_sample, max_frame_length) != i2s_details:
+                    if i2s:
+                        i2s.deinit()
+
+                    i2s = I2S(
+                        1,                  
+                        sck=self.sck_pin,
+                        ws=self.ws_pin,
+                        sd=self.sd_pin,
+                        mode=I2S.TX,
+                        bits=bits_per_sample,
+                        format= I2S.MONO if num_channels == 1 else I2S.STEREO,
+                        rate=sample_rate,
+                        ibuf=max(I2S_MIN_BUFFER, I2S_BUFFER_FRAMES * max_frame_length),
+                    )
+                    # Writing through a stream puts I2S in non-blocking asyncio mode.
+                    i2s_writer = asyncio.StreamWriter(i2s)
+                    i2s_details = (sample_rate, num_channels, bits_per_sample, max_frame_length)
+
+                # Frames are read into one buffer that is only reallocated if the packet size changes.
+                if frame_buf is None or len(frame_buf) != max_frame_length:
+                    frame_buf = memoryview(bytearray(max_frame_length))
+
+                # Send ack packet, waiting for it to be flushed if the client isn't reading.
+                writer.write(_ACK)
+                await writer.drain()
+
+                if not await self.play_frames(reader, i2s_writer, frame_buf):
+                    break
+        finally:
+            writer.close()
+            await writer.wait_closed()
+
+    async def play_frames(self, reader: StreamReader, i2s_writer: StreamWriter, frame_buf: memoryview) -> bool:
+        """
+        Play audio data frames until the end frame.
 
-        # Read audio details packet
-        audio_details = await reader.read(20)
-        sample_rate, num_channels, bits_per_sample, num_samples, packet_size = struct.unpack("IIIII", audio_details)
-
-        i2s = I2S(
-            1,                  
-            sck=self.sck_pin,
-            ws=self.ws_pin,
-            sd=self.sd_pin,
-            mode=I2S.TX,
-            bits=bits_per_sample,
-            format= I2S.MONO if num_channels == 1 else I2S.STEREO,
-            rate=sample_rate,
-            ibuf=4000,
-        )
-
-        # Send ack packet
-        writer.write(struct.pack("B", 0xAD))
-
-        # Audio packet loop
-        samples_read = 0
-        while samples_read < num_samples:
-            audio_packet = await reader.read(packet_size * (bits_per_sample // 8) * num_channels)
-            samples_read += packet_size
-
-            # Send ack packet
-            writer.write(struct.pack("B", 0xAD))
-
-            i2s.write(audio_packet)
-
+        Params:
+            reader: The stream to read frames from.
+            i2s_writer: The stream of the I2S output to play the frames on.
+            frame_buf: The buffer to read frames into, sized to the largest valid frame.
 
+        Returns:
+            bool: True if the end frame was reached, False if the connection should be closed.
+        """
+        while True:
+            try:
+                frame_length = struct.unpack(_LEN, await reader.readexactly(_LEN_SIZE))[0]
+                if not frame_length:
+                    return True
+
+                if frame_length > len(frame_buf):
+                    print(f"Invalid audio frame length: {frame_length} expected at most: {len(frame_buf)}")
+                    return False
+
+                audio_packet = frame_buf[:frame_length]
+                await readinto_exactly(reader, audio_packet)
+            except EOFError:
+                return False
+
+            # Waits while the I2S buffer is full, which is what paces the client.
+            # Once drained the frame is copied into the I2S buffer so frame_buf can be reused.
+            i2s_writer.out_buf = audio_packet
+            await i2s_writer.drain()